@@ -11,7 +11,10 @@ from functools import lru_cache
 class Settings:
     app_name: str = "Document Intelligence"
     app_version: str = "1.0.0"
+    environment: str = os.getenv("APP_ENV", "development")
     max_upload_mb: int = int(os.getenv("MAX_UPLOAD_MB", "25"))
+    max_cached_docs: int = int(os.getenv("MAX_CACHED_DOCS", "32"))
+    doc_ttl_seconds: int = int(os.getenv("DOC_TTL_SECONDS", "3600"))
     default_api_url: str = os.getenv("API_BASE_URL", "http://localhost:8000")
 
 
@@ -2,30 +2,55 @@
 
 from __future__ import annotations
 
+import io
 from typing import Any
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import BackgroundTasks, FastAPI, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 
 from app.config import get_settings
-from app.models import ProcessResponse, QARequest, QAResponse
-from src.exporter import export_csv, export_excel, export_json
+from app.models import (
+    DocumentStatus,
+    ProcessResponse,
+    QARequest,
+    QAResponse,
+    StatusResponse,
+    UploadResponse,
+)
+from app.store import TTLStore
+from src.document_loader import compute_document_id
 from src.pipeline import ProcessedDocument, run_pipeline
-from src.qa_engine import answer_question
+
 
 settings = get_settings()
 app = FastAPI(title=settings.app_name, version=settings.app_version)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+# In production CORS is answered by the reverse proxy in front of the workers.
+if settings.environment != "production":
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+DOCUMENT_STORE: TTLStore[ProcessedDocument] = TTLStore(
+    maxsize=settings.max_cached_docs,
+    ttl_seconds=settings.doc_ttl_seconds,
+)
+JOB_STATUS: TTLStore[StatusResponse] = TTLStore(
+    maxsize=settings.max_cached_docs,
+    ttl_seconds=settings.doc_ttl_seconds,
 )
 
-DOCUMENT_STORE: dict[str, ProcessedDocument] = {}
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
 
 
 @app.get("/")
@@ -42,48 +67,126 @@ def health() -> dict[str, Any]:
     return {
         "status": "ok",
         "documents_cached": len(DOCUMENT_STORE),
+        "max_cached_documents": DOCUMENT_STORE.maxsize,
+        "document_ttl_seconds": DOCUMENT_STORE.ttl_seconds,
         "max_upload_mb": settings.max_upload_mb,
     }
 
 
-@app.post("/process", response_model=ProcessResponse)
-async def process_document(file: UploadFile = File(...)) -> ProcessResponse:
+def _validate_upload(file: UploadFile) -> None:
     if not file.filename:
         raise HTTPException(status_code=400, detail="Filename is missing.")
 
-    content = await file.read()
-    max_bytes = settings.max_upload_mb * 1024 * 1024
-    if len(content) > max_bytes:
+    size = file.size
+    if size is None:
+        size = file.file.seek(0, io.SEEK_END)
+        file.file.seek(0)
+
+    if size > settings.max_upload_mb * 1024 * 1024:
         raise HTTPException(
             status_code=413,
             detail=f"File too large. Max allowed size is {settings.max_upload_mb} MB.",
         )
 
+
+async def _read_upload(file: UploadFile) -> bytes:
+    _validate_upload(file)
+    return await file.read()
+
+
+def _run_pipeline_job(content: bytes, filename: str, document_id: str) -> None:
+    try:
+        result = run_pipeline(content, filename)
+    except ValueError as exc:
+        JOB_STATUS[document_id] = StatusResponse(
+            document_id=document_id, status=DocumentStatus.FAILED, detail=str(exc)
+        )
+        return
+    except Exception as exc:
+        JOB_STATUS[document_id] = StatusResponse(
+            document_id=document_id,
+            status=DocumentStatus.FAILED,
+            detail=f"Processing failed: {exc}",
+        )
+        return
+
+    # Completed documents are tracked by DOCUMENT_STORE alone, so their status
+    # expires together with the document.
+    DOCUMENT_STORE[result.document_id] = result
+    JOB_STATUS.pop(document_id)
+
+
+@app.post("/process", response_model=ProcessResponse)
+async def process_document(file: UploadFile = File(...)) -> Response:
+    # The spooled upload file is handed to the loader as-is, so large files
+    # that Starlette already spilled to disk are not copied back into memory.
+    _validate_upload(file)
+
     try:
-        result = run_pipeline(content, file.filename)
+        result = await run_in_threadpool(run_pipeline, file.file, file.filename)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Processing failed: {exc}") from exc
 
     DOCUMENT_STORE[result.document_id] = result
-    return ProcessResponse(**result.response_payload())
+    JOB_STATUS.pop(result.document_id)
+    return Response(content=result.payload_json(), media_type="application/json")
+
+
+@app.post("/process/async", response_model=UploadResponse, status_code=202)
+async def process_document_async(
+    background_tasks: BackgroundTasks, file: UploadFile = File(...)
+) -> UploadResponse:
+    content = await _read_upload(file)
+    document_id = compute_document_id(content, file.filename)
+
+    JOB_STATUS[document_id] = StatusResponse(
+        document_id=document_id, status=DocumentStatus.PROCESSING
+    )
+    background_tasks.add_task(_run_pipeline_job, content, file.filename, document_id)
+    return UploadResponse(
+        document_id=document_id,
+        filename=file.filename,
+        status=DocumentStatus.PROCESSING,
+    )
+
+
+@app.get("/status/{document_id}", response_model=StatusResponse)
+def document_status(document_id: str) -> StatusResponse:
+    # The document store is authoritative: JOB_STATUS only holds jobs that are
+    # still processing or have failed, so an evicted document reads as gone.
+    if DOCUMENT_STORE.get(document_id):
+        return StatusResponse(document_id=document_id, status=DocumentStatus.COMPLETED)
+    status = JOB_STATUS.get(document_id)
+    if status:
+        return status
+    raise HTTPException(status_code=404, detail="Document not found in current session.")
+
+
+@app.get("/documents/{document_id}", response_model=ProcessResponse)
+def get_document(document_id: str) -> Response:
+    document = DOCUMENT_STORE.get(document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found in current session.")
+    return Response(content=document.payload_json(), media_type="application/json")
 
 
 @app.post("/qa", response_model=QAResponse)
-def ask_question(payload: QARequest) -> QAResponse:
+def ask_question(payload: QARequest) -> Response:
     document = DOCUMENT_STORE.get(payload.document_id)
     if not document:
         raise HTTPException(status_code=404, detail="Document not found in current session.")
 
-    qa_result = answer_question(payload.question, document.chunks)
-    return QAResponse(
+    qa_result = document.answer(payload.question)
+    response = QAResponse.model_construct(
         document_id=payload.document_id,
         question=payload.question,
         answer=str(qa_result["answer"]),
         sources=list(qa_result["sources"]),
         confidence=float(qa_result["confidence"]),
     )
+    return Response(content=response.model_dump_json(), media_type="application/json")
 
 
 @app.get("/export/{document_id}/{export_format}")
@@ -92,47 +195,21 @@ def export_document(document_id: str, export_format: str) -> Response:
     if not document:
         raise HTTPException(status_code=404, detail="Document not found in current session.")
 
-    safe_name = document.filename.rsplit(".", 1)[0]
-
-    if export_format == "json":
-        payload = {
-            "document": document.response_payload(),
-            "full_text": document.text,
-        }
-        data = export_json(payload)
-        return Response(
-            content=data,
-            media_type="application/json",
-            headers={
-                "Content-Disposition": f'attachment; filename="{safe_name}_entities.json"'
-            },
-        )
+    media_type = EXPORT_MEDIA_TYPES.get(export_format)
+    if media_type is None:
+        raise HTTPException(status_code=400, detail="Invalid format. Use json, csv, or xlsx.")
 
-    if export_format == "csv":
-        data = export_csv(document.entities)
-        return Response(
-            content=data,
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f'attachment; filename="{safe_name}_entities.csv"'
-            },
-        )
+    headers = {
+        "Content-Disposition": f'attachment; filename="{document.file_stem}_entities.{export_format}"'
+    }
 
-    if export_format == "xlsx":
-        data = export_excel(
-            filename=document.filename,
-            summary=document.summary,
-            key_points=document.key_points,
-            entities=document.entities,
-        )
-        return Response(
-            content=data,
-            media_type=(
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            ),
-            headers={
-                "Content-Disposition": f'attachment; filename="{safe_name}_entities.xlsx"'
-            },
+    if export_format == "json":
+        return StreamingResponse(
+            document.iter_json_export(), media_type=media_type, headers=headers
         )
 
-    raise HTTPException(status_code=400, detail="Invalid format. Use json, csv, or xlsx.")
+    return Response(
+        content=document.export_bytes(export_format),
+        media_type=media_type,
+        headers=headers,
+    )
@@ -2,14 +2,22 @@
 
 from __future__ import annotations
 
+from enum import Enum
 from typing import Any
 
 from pydantic import BaseModel, Field
 
 
+class DocumentStatus(str, Enum):
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
 class ProcessResponse(BaseModel):
     document_id: str
     filename: str
+    file_stem: str
     page_count: int
     word_count: int
     processing_mode: str
@@ -32,3 +40,15 @@ class QAResponse(BaseModel):
     answer: str
     sources: list[str]
     confidence: float = Field(ge=0.0, le=1.0)
+
+
+class UploadResponse(BaseModel):
+    document_id: str
+    filename: str
+    status: DocumentStatus
+
+
+class StatusResponse(BaseModel):
+    document_id: str
+    status: DocumentStatus
+    detail: str | None = None
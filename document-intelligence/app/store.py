@@ -0,0 +1,62 @@
+"""Bounded in-memory storage for processed documents."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLStore(Generic[V]):
+    """LRU mapping whose entries also expire after ``ttl_seconds`` without access.
+
+    Request handlers run on a thread pool, so every operation takes a lock.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._items: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> V | None:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+
+            now = time.monotonic()
+            if entry[0] <= now:
+                del self._items[key]
+                return None
+
+            self._items[key] = (now + self.ttl_seconds, entry[1])
+            self._items.move_to_end(key)
+            return entry[1]
+
+    def __setitem__(self, key: str, value: V) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._items[key] = (now + self.ttl_seconds, value)
+            self._items.move_to_end(key)
+            self._purge_expired(now)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def pop(self, key: str) -> V | None:
+        with self._lock:
+            entry = self._items.pop(key, None)
+            return None if entry is None else entry[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            return len(self._items)
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [key for key, (expires_at, _) in self._items.items() if expires_at <= now]
+        for key in expired:
+            del self._items[key]
@@ -6,15 +6,36 @@ OCR, entity extraction, summarization, and Q&A.
 
 from __future__ import annotations
 
+import html
 import os
-from typing import Any
+import threading
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Callable, Iterator
 
+import orjson
+import pyarrow as pa
 import requests
 import streamlit as st
-
+from requests.adapters import HTTPAdapter
+from urllib3.fields import RequestField
+from urllib3.filepost import choose_boundary
+from urllib3.util.retry import Retry
+
+from app.store import TTLStore
+from app.ui_theme import (
+    CHAT_ITEM_TEMPLATE,
+    HEADER_BLOCK,
+    HIGHLIGHTED_METRICS,
+    METRIC_CARD_TEMPLATE,
+    footer_markup,
+    panel_title_markup,
+)
 from src.exporter import export_csv, export_excel, export_json
-from src.pipeline import ProcessedDocument, run_pipeline
-from src.qa_engine import answer_question
+from src.qa_engine import MAX_CACHED_ANSWERS, question_key
+
+if TYPE_CHECKING:
+    from src.pipeline import ProcessedDocument
 
 st.set_page_config(
     page_title="Document Intelligence System",
@@ -39,319 +60,23 @@ def resolve_api_base_url() -> str:
 
 API_BASE_URL = resolve_api_base_url()
 
-THEME_CSS = """
-<style>
-@import url('https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&display=swap');
-
-:root {
-  --navy-900: #0f172a;
-  --navy-800: #1e293b;
-  --navy-700: #334155;
-  --navy-600: #475569;
-  --navy-500: #64748b;
-  --navy-400: #94a3b8;
-  --navy-300: #cbd5e1;
-  --navy-200: #e2e8f0;
-  --navy-100: #f1f5f9;
-  --navy-50: #f8fafc;
-  --accent-indigo: #6366f1;
-  --accent-indigo-light: #818cf8;
-  --accent-emerald: #10b981;
-  --accent-amber: #f59e0b;
-  --gradient-premium: linear-gradient(135deg, #6366f1 0%, #8b5cf6 50%, #a855f7 100%);
-}
-
-html, body, [class*="css"], .stApp {
-  font-family: 'DM Sans', sans-serif !important;
-}
-
-.stApp {
-  background: var(--navy-50);
-  color: var(--navy-800);
-}
-
-.block-container {
-  max-width: 1400px;
-  padding-top: 2rem;
-  padding-bottom: 3rem;
-}
-
-/* Header Styles */
-.system-header {
-  background: white;
-  border: 1px solid var(--navy-200);
-  border-radius: 12px;
-  padding: 1.25rem 1.5rem;
-  margin-bottom: 1.5rem;
-  box-shadow: 0 1px 3px rgba(15, 23, 42, 0.05);
-}
-
-.system-title {
-  display: flex;
-  align-items: center;
-  gap: 0.75rem;
-  font-size: 1.25rem;
-  font-weight: 600;
-  color: var(--navy-900);
-  margin-bottom: 1rem;
-}
-
-.system-title-icon {
-  width: 36px;
-  height: 36px;
-  background: var(--gradient-premium);
-  border-radius: 8px;
-  display: flex;
-  align-items: center;
-  justify-content: center;
-  font-size: 1.1rem;
-}
-
-.status-row {
-  display: grid;
-  grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-  gap: 0.75rem;
-}
-
-.status-badge {
-  display: flex;
-  align-items: center;
-  gap: 0.5rem;
-  padding: 0.6rem 0.85rem;
-  background: var(--navy-50);
-  border: 1px solid var(--navy-200);
-  border-radius: 8px;
-  font-size: 0.8rem;
-  font-weight: 500;
-  color: var(--navy-700);
-}
-
-.status-indicator {
-  width: 8px;
-  height: 8px;
-  border-radius: 50%;
-  background: var(--accent-emerald);
-}
-
-.status-indicator.processing { background: var(--accent-amber); animation: pulse 2s infinite; }
-.status-indicator.indigo { background: var(--accent-indigo); }
-
-@keyframes pulse {
-  0%, 100% { opacity: 1; }
-  50% { opacity: 0.5; }
-}
-
-/* Panel Styles */
-.panel-card {
-  background: white;
-  border: 1px solid var(--navy-200);
-  border-radius: 12px;
-  padding: 1.25rem;
-  margin-bottom: 1rem;
-  box-shadow: 0 1px 3px rgba(15, 23, 42, 0.05);
-}
-
-.panel-title {
-  display: flex;
-  align-items: center;
-  gap: 0.5rem;
-  font-size: 0.85rem;
-  font-weight: 600;
-  text-transform: uppercase;
-  letter-spacing: 0.05em;
-  color: var(--accent-indigo);
-  margin-bottom: 1rem;
-  padding-bottom: 0.75rem;
-  border-bottom: 1px solid var(--navy-100);
-}
-
-.panel-title-icon {
-  font-size: 1rem;
-}
-
-/* Metric Styles */
-.metric-card {
-  background: var(--navy-50);
-  border: 1px solid var(--navy-200);
-  border-radius: 8px;
-  padding: 0.85rem;
-  margin-bottom: 0.75rem;
-}
-
-.metric-label {
-  font-size: 0.75rem;
-  color: var(--navy-500);
-  text-transform: uppercase;
-  letter-spacing: 0.05em;
-  margin-bottom: 0.25rem;
-}
-
-.metric-value {
-  font-size: 1.25rem;
-  font-weight: 700;
-  color: var(--navy-900);
-}
-
-.metric-value.highlight {
-  color: var(--accent-indigo);
-}
-
-/* File Uploader */
-[data-testid="stFileUploader"] {
-  border: 2px dashed var(--navy-300) !important;
-  border-radius: 12px !important;
-  background: var(--navy-50) !important;
-}
-
-[data-testid="stFileUploader"]:hover {
-  border-color: var(--accent-indigo) !important;
-  background: rgba(99, 102, 241, 0.05) !important;
-}
-
-/* Button Styles */
-.stButton > button, .stDownloadButton > button {
-  width: 100%;
-  border: none !important;
-  background: var(--accent-indigo) !important;
-  color: white !important;
-  border-radius: 8px !important;
-  font-size: 0.85rem !important;
-  font-weight: 600 !important;
-  padding: 0.65rem 1rem !important;
-  transition: all 0.2s ease !important;
-}
-
-.stButton > button:hover, .stDownloadButton > button:hover {
-  background: #4f46e5 !important;
-  transform: translateY(-1px);
-  box-shadow: 0 4px 12px rgba(99, 102, 241, 0.3) !important;
-}
-
-.stButton > button:active {
-  transform: translateY(0);
-}
-
-/* Secondary Button */
-button[kind="secondary"] {
-  background: white !important;
-  border: 1px solid var(--navy-300) !important;
-  color: var(--navy-700) !important;
-}
-
-button[kind="secondary"]:hover {
-  background: var(--navy-50) !important;
-  border-color: var(--navy-400) !important;
-}
-
-/* Input Styles */
-.stTextInput > div > div > input,
-.stTextArea textarea {
-  background: white !important;
-  color: var(--navy-800) !important;
-  border: 1px solid var(--navy-300) !important;
-  border-radius: 8px !important;
-  font-family: 'DM Sans', sans-serif !important;
-}
-
-.stTextInput > div > div > input:focus,
-.stTextArea textarea:focus {
-  border-color: var(--accent-indigo) !important;
-  box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.1) !important;
-}
-
-/* DataFrames */
-[data-testid="stDataFrame"] {
-  border: 1px solid var(--navy-200) !important;
-  border-radius: 8px !important;
-}
-
-/* Code Blocks */
-div[data-testid="stMarkdownContainer"] code {
-  background: var(--navy-100) !important;
-  color: var(--navy-700) !important;
-  border-radius: 4px !important;
-  padding: 0.2rem 0.4rem !important;
-  font-family: 'JetBrains Mono', monospace !important;
-  font-size: 0.85rem !important;
-}
-
-/* Summary Points */
-.summary-point {
-  display: flex;
-  align-items: flex-start;
-  gap: 0.5rem;
-  margin-bottom: 0.5rem;
-  font-size: 0.9rem;
-  color: var(--navy-700);
-}
-
-.summary-point::before {
-  content: "•";
-  color: var(--accent-indigo);
-  font-weight: bold;
-}
-
-/* Q&A Chat */
-.chat-item {
-  background: var(--navy-50);
-  border: 1px solid var(--navy-200);
-  border-radius: 8px;
-  padding: 1rem;
-  margin-bottom: 1rem;
-}
-
-.chat-question {
-  font-weight: 600;
-  color: var(--navy-900);
-  margin-bottom: 0.5rem;
-}
-
-.chat-answer {
-  color: var(--navy-700);
-  line-height: 1.6;
-  margin-bottom: 0.5rem;
-}
-
-.chat-meta {
-  font-size: 0.8rem;
-  color: var(--navy-500);
-  padding-top: 0.5rem;
-  border-top: 1px solid var(--navy-200);
-}
-
-/* Footer */
-.system-footer {
-  font-size: 0.8rem;
-  color: var(--navy-500);
-  text-align: center;
-  padding-top: 1.5rem;
-  margin-top: 2rem;
-  border-top: 1px solid var(--navy-200);
-}
-
-/* Responsive */
-@media (max-width: 768px) {
-  .block-container {
-    padding-top: 1rem;
-  }
-  
-  .system-header {
-    padding: 1rem;
-  }
-  
-  .status-row {
-    grid-template-columns: 1fr;
-  }
-}
-</style>
-"""
+LOCAL_RESULT_CACHE_SIZE = 16
+LOCAL_RESULT_TTL_SECONDS = 3600
+UPLOAD_CHUNK_SIZE = 256 * 1024
+API_HEALTH_TTL_SECONDS = 30
+MAX_QA_HISTORY = 20
+OCR_PREVIEW_CHARS = 2000
 
 
 def init_state() -> None:
     defaults: dict[str, Any] = {
         "processed": None,
+        "document": None,
+        "upload_key": "",
         "mode": "local",
         "qa_history": [],
+        "qa_history_html": [],
+        "document_cache": {},
         "last_error": "",
         "last_question": "",
     }
@@ -362,68 +87,270 @@ def init_state() -> None:
 
 
 def render_header() -> None:
-    st.markdown(THEME_CSS, unsafe_allow_html=True)
-    st.markdown(
-        """
-<div class="system-header">
-  <div class="system-title">
-    <div class="system-title-icon">📄</div>
-    <span>Document Intelligence System</span>
-  </div>
-  <div class="status-row">
-    <div class="status-badge">
-      <span class="status-indicator"></span>
-      OCR Engine Online
-    </div>
-    <div class="status-badge">
-      <span class="status-indicator indigo"></span>
-      Entity Extractor Active
-    </div>
-    <div class="status-badge">
-      <span class="status-indicator indigo"></span>
-      Q&A System Ready
-    </div>
-    <div class="status-badge">
-      <span class="status-indicator processing"></span>
-      Export Module Ready
-    </div>
-  </div>
-</div>
-        """,
-        unsafe_allow_html=True,
+    st.markdown(HEADER_BLOCK, unsafe_allow_html=True)
+
+
+def render_panel_title(icon: str, title: str) -> None:
+    st.markdown(panel_title_markup(icon, title), unsafe_allow_html=True)
+
+
+@st.cache_resource
+def api_session() -> requests.Session:
+    """Process-wide HTTP session, so API calls reuse pooled keep-alive connections.
+
+    Script-level objects are rebuilt on every rerun, and the processing and
+    Q&A workers call from their own threads, hence ``st.cache_resource``.
+    Only idempotent requests (the health probe) are retried.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
     )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _multipart_upload(boundary: str, file_name: str, file_bytes: bytes) -> Iterator[bytes]:
+    """Yield a ``multipart/form-data`` body for ``file_bytes`` in chunks.
+
+    ``requests`` assembles ``files=`` bodies into one extra full-size copy of
+    the upload; a generator body is sent with chunked transfer encoding.
+    """
+    field = RequestField(name="file", data=b"", filename=file_name)
+    field.make_multipart(content_type="application/octet-stream")
+    yield f"--{boundary}\r\n{field.render_headers()}".encode()
+
+    view = memoryview(file_bytes)
+    for start in range(0, len(view), UPLOAD_CHUNK_SIZE):
+        yield bytes(view[start : start + UPLOAD_CHUNK_SIZE])
+
+    yield f"\r\n--{boundary}--\r\n".encode()
 
 
 def process_via_api(file_name: str, file_bytes: bytes) -> dict[str, Any]:
-    files = {"file": (file_name, file_bytes, "application/octet-stream")}
-    response = requests.post(f"{API_BASE_URL}/process", files=files, timeout=180)
+    boundary = choose_boundary()
+    response = api_session().post(
+        f"{API_BASE_URL}/process",
+        data=_multipart_upload(boundary, file_name, file_bytes),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        timeout=(3, 180),
+    )
     response.raise_for_status()
-    payload = response.json()
+    payload = orjson.loads(response.content)
     payload["full_text"] = payload.get("text_preview", "")
     payload["chunks"] = []
     return payload
 
 
-def process_locally(file_name: str, file_bytes: bytes) -> dict[str, Any]:
-    result: ProcessedDocument = run_pipeline(file_bytes, file_name)
-    payload = result.response_payload()
-    payload["full_text"] = result.text
-    payload["chunks"] = result.chunks
+def process_locally(file_name: str, file_bytes: bytes) -> ProcessedDocument:
+    # The pipeline pulls in pypdf, Pillow and pytesseract; sessions that only
+    # talk to the API never need them, so import on first local run.
+    from src.pipeline import run_pipeline
+
+    return run_pipeline(file_bytes, file_name)
+
+
+def local_payload(document: ProcessedDocument) -> dict[str, Any]:
+    payload = document.response_payload()
+    payload["full_text"] = document.text
+    payload["chunks"] = document.chunks
     return payload
 
 
+@st.cache_data(ttl=API_HEALTH_TTL_SECONDS, show_spinner=False)
+def api_available() -> bool:
+    """Probe ``/health`` with a short timeout, remembered for a few seconds."""
+    try:
+        return api_session().get(f"{API_BASE_URL}/health", timeout=1.5).ok
+    except requests.RequestException:
+        return False
+
+
+@st.cache_resource
+def local_results() -> TTLStore[ProcessedDocument]:
+    """Process-wide cache of locally processed documents, keyed by upload key."""
+    return TTLStore(maxsize=LOCAL_RESULT_CACHE_SIZE, ttl_seconds=LOCAL_RESULT_TTL_SECONDS)
+
+
+@dataclass
+class ProcessingJob:
+    """Document processing running on a worker thread.
+
+    The worker never touches ``st.session_state``; the script thread copies
+    the result over once the thread has finished.
+    """
+
+    upload_key: str
+    thread: threading.Thread | None = None
+    payload: dict[str, Any] | None = None
+    document: ProcessedDocument | None = None
+    mode: str = "local"
+    error: str = ""
+
+    def run(self, file_name: str, file_bytes: bytes) -> None:
+        try:
+            self._process(file_name, file_bytes)
+        except Exception as exc:
+            self.error = f"Processing failed: {exc}"
+
+    def _process(self, file_name: str, file_bytes: bytes) -> None:
+        # A hung API would otherwise hold every upload for the full read
+        # timeout before the local fallback starts.
+        if api_available():
+            try:
+                self.payload, self.mode = process_via_api(file_name, file_bytes), "api"
+                return
+            except Exception:
+                api_available.clear()
+        # The local document keeps its chunk index and answer cache for Q&A.
+        self.document = process_locally(file_name, file_bytes)
+        self.payload, self.mode = local_payload(self.document), "local"
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+
 def process_document(file_name: str, file_bytes: bytes) -> None:
     st.session_state["last_error"] = ""
-    with st.spinner("Processing document... Ingest → OCR → Extract → Summarize"):
-        try:
-            payload = process_via_api(file_name, file_bytes)
-            st.session_state["mode"] = "api"
-        except Exception:
-            payload = process_locally(file_name, file_bytes)
-            st.session_state["mode"] = "local"
 
+    # Repeated clicks on the same upload reuse the result already in session.
+    upload_key = f"{file_name}:{blake2b(file_bytes, digest_size=16).hexdigest()}"
+    if st.session_state.get("processed") and st.session_state.get("upload_key") == upload_key:
+        return
+
+    job = st.session_state.get("processing_job")
+    if job is not None and job.running:
+        return
+
+    # Local results are shared across sessions, so a page refresh or another
+    # tab uploading the same file skips OCR and extraction entirely.
+    cached = local_results().get(upload_key)
+    if cached is not None:
+        apply_processing_result(upload_key, local_payload(cached), "local", cached)
+        return
+
+    job = ProcessingJob(upload_key=upload_key)
+    job.thread = threading.Thread(target=job.run, args=(file_name, file_bytes), daemon=True)
+    job.thread.start()
+    st.session_state["processing_job"] = job
+
+
+def collect_processing_job() -> None:
+    job = st.session_state.get("processing_job")
+    if job is None or job.running:
+        return
+
+    del st.session_state["processing_job"]
+    if job.error:
+        st.session_state["last_error"] = job.error
+        return
+
+    # API results point at a document the server may evict, so only
+    # self-contained local results are shared.
+    if job.document is not None:
+        local_results()[job.upload_key] = job.document
+    apply_processing_result(job.upload_key, job.payload, job.mode, job.document)
+
+
+def apply_processing_result(
+    upload_key: str,
+    payload: dict[str, Any],
+    mode: str,
+    document: ProcessedDocument | None = None,
+) -> None:
     st.session_state["processed"] = payload
+    st.session_state["document"] = document
+    st.session_state["mode"] = mode
+    st.session_state["upload_key"] = upload_key
     st.session_state["qa_history"] = []
+    st.session_state["qa_history_html"] = []
+    st.session_state["document_cache"] = cache = {}
+
+    # Build the exports while the user is still reading the results, so the
+    # first download click is usually a cache hit.
+    threading.Thread(target=prewarm_exports, args=(cache, payload), daemon=True).start()
+
+
+@st.fragment(run_every=1.0)
+def render_processing_progress() -> None:
+    # Only rendered while a job is in flight, so the timer stops with it.
+    job = st.session_state.get("processing_job")
+    if job is None:
+        return
+    if job.running:
+        st.info("⏳ Processing document... Ingest → OCR → Extract → Summarize")
+        return
+    st.rerun()
+
+
+def chat_item_markup(item: dict[str, Any]) -> str:
+    # Questions are user input and answers quote the document, so both are
+    # escaped once here rather than trusted as markup on every render.
+    return CHAT_ITEM_TEMPLATE.format(
+        question=html.escape(item["question"]),
+        answer=html.escape(item["answer"]),
+        sources=html.escape(", ".join(item["sources"])) if item["sources"] else "N/A",
+        confidence=f"{item['confidence']:.0%}",
+    )
+
+
+def ask_api(document_id: str, question: str) -> dict[str, Any]:
+    response = api_session().post(
+        f"{API_BASE_URL}/qa",
+        json={"document_id": document_id, "question": question},
+        timeout=(3, 90),
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+def qa_item(question: str, payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "question": question,
+        "answer": payload["answer"],
+        "sources": payload.get("sources", []),
+        "confidence": payload.get("confidence", 0.0),
+    }
+
+
+def record_qa_item(item: dict[str, Any]) -> None:
+    history = st.session_state["qa_history"]
+    history_html = st.session_state["qa_history_html"]
+    history.append(item)
+    # Rendered once per turn and kept in lockstep with qa_history, so
+    # reruns only join the cached strings.
+    history_html.append(chat_item_markup(item))
+    # Only the latest turns are shown; long-lived tabs keep a bounded tail.
+    del history[:-MAX_QA_HISTORY], history_html[:-MAX_QA_HISTORY]
+
+
+@dataclass
+class QAJob:
+    """Question sent to the API on a worker thread.
+
+    Like ``ProcessingJob``, the worker only fills in its own fields; the
+    script thread records the answer once the thread has finished.
+    """
+
+    document_id: str
+    question: str
+    thread: threading.Thread | None = None
+    payload: dict[str, Any] | None = None
+    error: str = ""
+
+    def run(self) -> None:
+        try:
+            self.payload = ask_api(self.document_id, self.question)
+        except Exception as exc:
+            self.error = f"Q&A failed: {exc}"
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
 
 
 def run_qa(question: str) -> None:
@@ -431,44 +358,77 @@ def run_qa(question: str) -> None:
     if not processed or not question.strip():
         return
 
-    mode = st.session_state.get("mode", "local")
+    # A second click on an unchanged question would only repeat the last turn.
+    history = st.session_state["qa_history"]
+    if history and history[-1]["question"] == question:
+        return
 
-    try:
-        if mode == "api":
-            response = requests.post(
-                f"{API_BASE_URL}/qa",
-                json={
-                    "document_id": processed["document_id"],
-                    "question": question,
-                },
-                timeout=90,
-            )
-            response.raise_for_status()
-            payload = response.json()
-        else:
-            qa_result = answer_question(question, processed.get("chunks", []))
-            payload = {
-                "answer": qa_result["answer"],
-                "sources": qa_result["sources"],
-                "confidence": qa_result["confidence"],
-            }
-
-        st.session_state["qa_history"].append(
-            {
-                "question": question,
-                "answer": payload["answer"],
-                "sources": payload.get("sources", []),
-                "confidence": payload.get("confidence", 0.0),
-            }
-        )
-    except Exception as exc:
-        st.session_state["last_error"] = f"Q&A failed: {exc}"
+    # Local answers come straight from the document's index, and
+    # ProcessedDocument.answer already caches them by question terms.
+    document = st.session_state.get("document")
+    if document is not None:
+        try:
+            payload = document.answer(question)
+        except Exception as exc:
+            st.session_state["last_error"] = f"Q&A failed: {exc}"
+            return
+        record_qa_item(qa_item(question, payload))
+        return
+
+    # API answers are cached here under the same key, so repeats and
+    # rephrasings skip the round trip.
+    payload = cached_for_document("qa_answers", dict).get(question_key(question))
+    if payload is not None:
+        record_qa_item(qa_item(question, payload))
+        return
+
+    # API answers can take seconds, so they run on a worker thread.
+    job = st.session_state.get("qa_job")
+    if job is not None and job.running:
+        return
+    job = QAJob(document_id=processed["document_id"], question=question)
+    job.thread = threading.Thread(target=job.run, daemon=True)
+    job.thread.start()
+    st.session_state["qa_job"] = job
 
 
+def collect_qa_job() -> None:
+    job = st.session_state.get("qa_job")
+    if job is None or job.running:
+        return
+
+    del st.session_state["qa_job"]
+    processed = st.session_state.get("processed")
+    # Drop answers for a document that has since been replaced.
+    if not processed or processed["document_id"] != job.document_id:
+        return
+    if job.error:
+        st.session_state["last_error"] = job.error
+        return
+    answers = cached_for_document("qa_answers", dict)
+    if len(answers) < MAX_CACHED_ANSWERS:
+        answers[question_key(job.question)] = job.payload
+    record_qa_item(qa_item(job.question, job.payload))
+
+
+@st.fragment(run_every=0.5)
+def render_qa_progress() -> None:
+    job = st.session_state.get("qa_job")
+    if job is None:
+        return
+    if job.running:
+        st.caption("⏳ Looking for an answer...")
+        return
+    st.rerun()
+
+
+@st.fragment
 def render_upload_panel() -> None:
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">📤</span>Document Upload</div>', unsafe_allow_html=True)
+    # Runs as a fragment: picking a file only reruns this panel, not the
+    # header and the other panels. Processing switches the layout, so it
+    # triggers a full rerun.
+    with st.container(border=True, key="panel-upload"):
+        render_panel_title("📤", "Document Upload")
         
         st.write("**Upload any document to extract structured data**")
         st.caption("Supports: PDF, PNG, JPG, TIFF | No templates required")
@@ -483,54 +443,115 @@ def render_upload_panel() -> None:
             "🚀 Process Document",
             key="process-btn",
             use_container_width=True,
+            disabled="processing_job" in st.session_state,
         )
 
         if process_click and uploaded_file is not None:
             process_document(uploaded_file.name, uploaded_file.getvalue())
+            st.rerun()
         elif process_click and uploaded_file is None:
             st.session_state["last_error"] = "Please upload a document before processing."
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            st.rerun()
+
+
+def metrics_markup(processed: dict[str, Any], mode: str) -> str:
+    """All metric cards as one block, so the panel sends a single element."""
+    metrics = [
+        ("Pages", str(processed.get("page_count", "-"))),
+        ("Words", str(processed.get("word_count", "-"))),
+        ("Processing Mode", processed.get("processing_mode", "-")),
+        ("Connection", mode.upper()),
+    ]
+    return "".join(
+        METRIC_CARD_TEMPLATE.format(
+            label=label,
+            value=value,
+            highlight="highlight" if label in HIGHLIGHTED_METRICS else "",
+        )
+        for label, value in metrics
+    )
 
 
 def render_status_panel() -> None:
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">📊</span>Processing Metrics</div>', unsafe_allow_html=True)
+    with st.container(border=True, key="panel-metrics"):
+        render_panel_title("📊", "Processing Metrics")
         
         processed = st.session_state.get("processed")
 
         if not processed:
             st.info("Upload a document to see processing metrics.")
         else:
-            metrics = [
-                ("Pages", str(processed.get("page_count", "-"))),
-                ("Words", str(processed.get("word_count", "-"))),
-                ("Processing Mode", processed.get("processing_mode", "-")),
-                ("Connection", st.session_state.get("mode", "local").upper()),
-            ]
-
-            for label, value in metrics:
-                highlight = "highlight" if label in ["Pages", "Words"] else ""
-                st.markdown(
-                    f"<div class='metric-card'><div class='metric-label'>{label}</div><div class='metric-value {highlight}'>{value}</div></div>",
-                    unsafe_allow_html=True,
-                )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            metrics_html = cached_for_document(
+                "metrics_html",
+                lambda: metrics_markup(processed, st.session_state.get("mode", "local")),
+            )
+            st.markdown(metrics_html, unsafe_allow_html=True)
+
 
+def _build_cached(cache: dict[str, Any], key: str, build: Callable[[], Any]) -> Any:
+    value = cache.get(key)
+    if value is None:
+        value = cache[key] = build()
+    return value
 
+
+def cached_for_document(key: str, build: Callable[[], Any]) -> Any:
+    # Anything derived from the processed document only changes when a new
+    # document is collected, which resets this cache; reruns reuse the value.
+    return _build_cached(st.session_state["document_cache"], key, build)
+
+
+def deferred_for_document(key: str, build: Callable[[], Any]) -> Callable[[], Any]:
+    """Like ``cached_for_document``, but only builds when the callable is invoked.
+
+    ``st.download_button`` calls it on click from a separate thread, so the
+    cache dict is captured now rather than looked up in session state then.
+    """
+    cache = st.session_state["document_cache"]
+    return lambda: _build_cached(cache, key, build)
+
+
+def export_builders(processed: dict[str, Any]) -> dict[str, Callable[[], bytes]]:
+    return {
+        "json": lambda: export_json(processed),
+        "csv": lambda: export_csv(processed.get("entities", {})),
+        "xlsx": lambda: export_excel(
+            filename=processed.get("filename", "document"),
+            summary=processed.get("summary", ""),
+            key_points=processed.get("key_points", []),
+            entities=processed.get("entities", {}),
+        ),
+    }
+
+
+def prewarm_exports(cache: dict[str, Any], processed: dict[str, Any]) -> None:
+    for fmt, build in export_builders(processed).items():
+        _build_cached(cache, f"export:{fmt}", build)
+
+
+def ocr_preview(text: str, limit: int = OCR_PREVIEW_CHARS) -> tuple[str, str]:
+    """Preview text and its truncation caption ("" when nothing was cut)."""
+    if len(text) <= limit:
+        return text, ""
+    return (
+        text[:limit] + "...",
+        f"Showing first {limit:,} characters of {len(text):,} total characters",
+    )
+
+
+@st.fragment
 def render_ocr_panel() -> None:
+    # The preview is an editable text area; edits only rerun this panel.
     processed = st.session_state.get("processed")
     if not processed:
         return
 
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">🔍</span>Extracted Text</div>', unsafe_allow_html=True)
+    with st.container(border=True, key="panel-ocr"):
+        render_panel_title("🔍", "Extracted Text")
         
-        text_content = processed.get("full_text", "")
-        preview_text = text_content[:2000] + ("..." if len(text_content) > 2000 else "")
+        preview_text, preview_caption = cached_for_document(
+            "ocr_preview", lambda: ocr_preview(processed.get("full_text", ""))
+        )
         
         st.text_area(
             "OCR Output Preview",
@@ -540,43 +561,69 @@ def render_ocr_panel() -> None:
             label_visibility="collapsed",
         )
         
-        if len(text_content) > 2000:
-            st.caption(f"Showing first 2,000 characters of {len(text_content):,} total characters")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+        if preview_caption:
+            st.caption(preview_caption)
+
+
+def entity_sections(
+    entities: dict[str, list[dict[str, Any]]],
+) -> list[tuple[str, str, list[dict[str, Any]]]]:
+    """Expander labels with per-type counts, built once per document."""
+    return [
+        (
+            entity_type,
+            f"**{entity_type.replace('_', ' ').title()}** ({len(values)} found)",
+            values,
+        )
+        for entity_type, values in entities.items()
+    ]
 
 
+@st.fragment
 def render_entity_panel() -> None:
+    # Expanding or collapsing a section reruns only this panel.
     processed = st.session_state.get("processed")
     if not processed:
         return
 
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">📋</span>Extracted Entities</div>', unsafe_allow_html=True)
-
-        entities = processed.get("entities", {})
-        if entities:
-            for entity_type, values in entities.items():
-                with st.expander(f"**{entity_type.replace('_', ' ').title()}** ({len(values)} found)"):
-                    if values:
-                        st.dataframe(values, use_container_width=True, hide_index=True)
-                    else:
+    with st.container(border=True, key="panel-entities"):
+        render_panel_title("📋", "Extracted Entities")
+
+        sections = cached_for_document(
+            "entity_sections", lambda: entity_sections(processed.get("entities", {}))
+        )
+        if sections:
+            for entity_type, label, values in sections:
+                # Collapsed sections track their state and skip their body,
+                # so only the types a user has opened build or send a table.
+                expander = st.expander(label, key=f"entities-{entity_type}", on_change="rerun")
+                if not expander.open:
+                    continue
+
+                with expander:
+                    if not values:
                         st.caption("No matches found for this entity type.")
+                        continue
+
+                    table = cached_for_document(
+                        f"entity_table:{entity_type}", lambda: pa.Table.from_pylist(values)
+                    )
+                    st.dataframe(table, use_container_width=True, hide_index=True)
         else:
             st.info("No entities extracted yet. Process a document to see results.")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
 
 
+@st.fragment
 def render_qa_panel() -> None:
+    # Typing and asking only rerun this panel. Errors are shown above the
+    # panels, outside the fragment, so a new one triggers a full rerun, as
+    # does an API answer arriving from its worker thread.
     processed = st.session_state.get("processed")
     if not processed:
         return
 
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">💬</span>Ask the Document</div>', unsafe_allow_html=True)
+    with st.container(border=True, key="panel-qa"):
+        render_panel_title("💬", "Ask the Document")
         
         st.caption("Ask questions about your document content. The system uses RAG to find relevant passages and generate answers.")
 
@@ -588,81 +635,84 @@ def render_qa_panel() -> None:
         )
         st.session_state["last_question"] = question
 
-        run_click = st.button("Ask Question", key="qa-run", use_container_width=True)
+        run_click = st.button(
+            "Ask Question",
+            key="qa-run",
+            use_container_width=True,
+            disabled="qa_job" in st.session_state,
+        )
         if run_click and question.strip():
+            previous_error = st.session_state.get("last_error")
             run_qa(question)
+            if st.session_state.get("last_error") != previous_error:
+                st.rerun()
+
+        if "qa_job" in st.session_state:
+            render_qa_progress()
 
         if st.session_state.get("qa_history"):
             st.markdown("---")
             st.markdown("**Recent Questions & Answers**")
             
-            for item in reversed(st.session_state["qa_history"][-4:]):
-                st.markdown(
-                    f"""
-                    <div class="chat-item">
-                        <div class="chat-question">Q: {item['question']}</div>
-                        <div class="chat-answer">{item['answer']}</div>
-                        <div class="chat-meta">
-                            Sources: {', '.join(item['sources']) if item['sources'] else 'N/A'} | 
-                            Confidence: {item['confidence']:.0%}
-                        </div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True,
-                )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            # Plain HTML: the escaped turns need no markdown pass.
+            recent = reversed(st.session_state["qa_history_html"][-4:])
+            st.html("".join(recent))
 
 
+@st.fragment
 def render_export_panel() -> None:
     processed = st.session_state.get("processed")
     if not processed:
         return
 
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">📥</span>Export Results</div>', unsafe_allow_html=True)
+    with st.container(border=True, key="panel-export"):
+        render_panel_title("📥", "Export Results")
         
         st.caption("Download extracted data in your preferred format")
 
+        builders = export_builders(processed)
+        stem = processed["file_stem"]
         col1, col2, col3 = st.columns(3)
         
         with col1:
             st.download_button(
                 "📄 JSON",
-                data=export_json(processed).decode("utf-8"),
-                file_name=f"{processed['filename'].rsplit('.', 1)[0]}_data.json",
+                data=deferred_for_document("export:json", builders["json"]),
+                file_name=f"{stem}_data.json",
                 mime="application/json",
                 use_container_width=True,
+                on_click="ignore",
                 key="export-json",
             )
         
         with col2:
             st.download_button(
                 "📊 CSV",
-                data=export_csv(processed.get("entities", {})).decode("utf-8"),
-                file_name=f"{processed['filename'].rsplit('.', 1)[0]}_data.csv",
+                data=deferred_for_document("export:csv", builders["csv"]),
+                file_name=f"{stem}_data.csv",
                 mime="text/csv",
                 use_container_width=True,
+                on_click="ignore",
                 key="export-csv",
             )
         
         with col3:
             st.download_button(
                 "📈 Excel",
-                data=export_excel(
-                    filename=processed.get("filename", "document"),
-                    summary=processed.get("summary", ""),
-                    key_points=processed.get("key_points", []),
-                    entities=processed.get("entities", {}),
-                ),
-                file_name=f"{processed['filename'].rsplit('.', 1)[0]}_data.xlsx",
+                data=deferred_for_document("export:xlsx", builders["xlsx"]),
+                file_name=f"{stem}_data.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True,
+                on_click="ignore",
                 key="export-xlsx",
             )
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def key_points_markup(key_points: list[str]) -> str:
+    """All key points as one HTML string, so the panel sends a single element."""
+    return "".join(
+        f"<div class='summary-point'>{html.escape(point)}</div>" for point in key_points
+    )
 
 
 def render_summary_panel() -> None:
@@ -670,9 +720,8 @@ def render_summary_panel() -> None:
     if not processed:
         return
 
-    with st.container():
-        st.markdown('<div class="panel-card">', unsafe_allow_html=True)
-        st.markdown('<div class="panel-title"><span class="panel-title-icon">📝</span>Document Summary</div>', unsafe_allow_html=True)
+    with st.container(border=True, key="panel-summary"):
+        render_panel_title("📝", "Document Summary")
         
         summary = processed.get("summary", "")
         if summary:
@@ -680,18 +729,16 @@ def render_summary_panel() -> None:
         else:
             st.info("No summary generated yet.")
         
-        key_points = processed.get("key_points", [])
-        if key_points:
+        key_points_html = cached_for_document(
+            "key_points_html", lambda: key_points_markup(processed.get("key_points", []))
+        )
+        if key_points_html:
             st.markdown("**Key Points:**")
-            for point in key_points:
-                st.markdown(f"<div class='summary-point'>{point}</div>", unsafe_allow_html=True)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown(key_points_html, unsafe_allow_html=True)
 
 
 def render_empty_state() -> None:
-    with st.container():
-        st.markdown('<div class="panel-card" style="text-align: center; padding: 3rem;">', unsafe_allow_html=True)
+    with st.container(border=True, key="panel-empty"):
         st.markdown("## 📄 Document Intelligence System")
         st.write("Transform unstructured documents into structured data")
         st.markdown("""
@@ -704,16 +751,20 @@ def render_empty_state() -> None:
         - 📊 Export to JSON, CSV, and Excel
         """)
         st.caption("Upload a document to get started →")
-        st.markdown('</div>', unsafe_allow_html=True)
 
 
 def main() -> None:
     init_state()
+    collect_processing_job()
+    collect_qa_job()
     render_header()
 
     if st.session_state.get("last_error"):
         st.error(st.session_state["last_error"])
 
+    if "processing_job" in st.session_state:
+        render_processing_progress()
+
     # Main content area
     processed = st.session_state.get("processed")
     
@@ -739,13 +790,7 @@ def main() -> None:
             render_export_panel()
 
     st.markdown(
-        f"""
-        <div class="system-footer">
-            API Endpoint: <code>{API_BASE_URL}</code> | 
-            Document Intelligence System v1.0 | 
-            Processing Mode: {st.session_state.get("mode", "local").upper()}
-        </div>
-        """,
+        footer_markup(API_BASE_URL, st.session_state.get("mode", "local")),
         unsafe_allow_html=True,
     )
 
@@ -0,0 +1,395 @@
+"""Static styles and markup for the Streamlit UI.
+
+Streamlit re-executes the app script on every rerun, but imported modules
+are only loaded once per process, so everything here (including the
+minified header block and the memoized helpers) is built a single time.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+COMMENT_PATTERN = re.compile(r"/\*.*?\*/|<!--.*?-->", re.DOTALL)
+INTER_TAG_WS_PATTERN = re.compile(r">\s+<")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _minify_markup(markup: str) -> str:
+    """Drop comments and collapse whitespace; the markup is resent on every rerun."""
+    markup = COMMENT_PATTERN.sub("", markup)
+    markup = INTER_TAG_WS_PATTERN.sub("><", markup)
+    return WHITESPACE_PATTERN.sub(" ", markup).strip()
+
+
+THEME_CSS = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=DM+Sans:wght@400;500;600;700&display=swap');
+
+:root {
+  --navy-900: #0f172a;
+  --navy-800: #1e293b;
+  --navy-700: #334155;
+  --navy-600: #475569;
+  --navy-500: #64748b;
+  --navy-400: #94a3b8;
+  --navy-300: #cbd5e1;
+  --navy-200: #e2e8f0;
+  --navy-100: #f1f5f9;
+  --navy-50: #f8fafc;
+  --accent-indigo: #6366f1;
+  --accent-indigo-light: #818cf8;
+  --accent-emerald: #10b981;
+  --accent-amber: #f59e0b;
+  --gradient-premium: linear-gradient(135deg, #6366f1 0%, #8b5cf6 50%, #a855f7 100%);
+}
+
+html, body, [class*="css"], .stApp {
+  font-family: 'DM Sans', sans-serif !important;
+}
+
+.stApp {
+  background: var(--navy-50);
+  color: var(--navy-800);
+}
+
+.block-container {
+  max-width: 1400px;
+  padding-top: 2rem;
+  padding-bottom: 3rem;
+}
+
+/* Header Styles */
+.system-header {
+  background: white;
+  border: 1px solid var(--navy-200);
+  border-radius: 12px;
+  padding: 1.25rem 1.5rem;
+  margin-bottom: 1.5rem;
+  box-shadow: 0 1px 3px rgba(15, 23, 42, 0.05);
+}
+
+.system-title {
+  display: flex;
+  align-items: center;
+  gap: 0.75rem;
+  font-size: 1.25rem;
+  font-weight: 600;
+  color: var(--navy-900);
+  margin-bottom: 1rem;
+}
+
+.system-title-icon {
+  width: 36px;
+  height: 36px;
+  background: var(--gradient-premium);
+  border-radius: 8px;
+  display: flex;
+  align-items: center;
+  justify-content: center;
+  font-size: 1.1rem;
+}
+
+.status-row {
+  display: grid;
+  grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+  gap: 0.75rem;
+}
+
+.status-badge {
+  display: flex;
+  align-items: center;
+  gap: 0.5rem;
+  padding: 0.6rem 0.85rem;
+  background: var(--navy-50);
+  border: 1px solid var(--navy-200);
+  border-radius: 8px;
+  font-size: 0.8rem;
+  font-weight: 500;
+  color: var(--navy-700);
+}
+
+.status-indicator {
+  width: 8px;
+  height: 8px;
+  border-radius: 50%;
+  background: var(--accent-emerald);
+}
+
+.status-indicator.processing { background: var(--accent-amber); animation: pulse 2s infinite; will-change: opacity; }
+.status-indicator.indigo { background: var(--accent-indigo); }
+
+@keyframes pulse {
+  0%, 100% { opacity: 1; }
+  50% { opacity: 0.5; }
+}
+
+/* Panel Styles: bordered st.container(key="panel-...") */
+[class*="st-key-panel-"] {
+  background: white;
+  border: 1px solid var(--navy-200);
+  border-radius: 12px;
+  padding: 1.25rem;
+  box-shadow: 0 1px 3px rgba(15, 23, 42, 0.05);
+}
+
+.st-key-panel-empty {
+  text-align: center;
+  padding: 3rem;
+}
+
+.panel-title {
+  display: flex;
+  align-items: center;
+  gap: 0.5rem;
+  font-size: 0.85rem;
+  font-weight: 600;
+  text-transform: uppercase;
+  letter-spacing: 0.05em;
+  color: var(--accent-indigo);
+  margin-bottom: 1rem;
+  padding-bottom: 0.75rem;
+  border-bottom: 1px solid var(--navy-100);
+}
+
+.panel-title-icon {
+  font-size: 1rem;
+}
+
+/* Metric Styles */
+.metric-card {
+  background: var(--navy-50);
+  border: 1px solid var(--navy-200);
+  border-radius: 8px;
+  padding: 0.85rem;
+  margin-bottom: 0.75rem;
+}
+
+.metric-label {
+  font-size: 0.75rem;
+  color: var(--navy-500);
+  text-transform: uppercase;
+  letter-spacing: 0.05em;
+  margin-bottom: 0.25rem;
+}
+
+.metric-value {
+  font-size: 1.25rem;
+  font-weight: 700;
+  color: var(--navy-900);
+}
+
+.metric-value.highlight {
+  color: var(--accent-indigo);
+}
+
+/* File Uploader */
+[data-testid="stFileUploader"] {
+  border: 2px dashed var(--navy-300) !important;
+  border-radius: 12px !important;
+  background: var(--navy-50) !important;
+}
+
+[data-testid="stFileUploader"]:hover {
+  border-color: var(--accent-indigo) !important;
+  background: rgba(99, 102, 241, 0.05) !important;
+}
+
+/* Button Styles */
+.stButton > button, .stDownloadButton > button {
+  width: 100%;
+  border: none !important;
+  background: var(--accent-indigo) !important;
+  color: white !important;
+  border-radius: 8px !important;
+  font-size: 0.85rem !important;
+  font-weight: 600 !important;
+  padding: 0.65rem 1rem !important;
+  transition: background-color 0.2s ease, transform 0.2s ease, box-shadow 0.2s ease !important;
+}
+
+.stButton > button:hover, .stDownloadButton > button:hover {
+  background: #4f46e5 !important;
+  transform: translateY(-1px);
+  box-shadow: 0 4px 12px rgba(99, 102, 241, 0.3) !important;
+}
+
+.stButton > button:active {
+  transform: translateY(0);
+}
+
+/* Secondary Button */
+button[kind="secondary"] {
+  background: white !important;
+  border: 1px solid var(--navy-300) !important;
+  color: var(--navy-700) !important;
+}
+
+button[kind="secondary"]:hover {
+  background: var(--navy-50) !important;
+  border-color: var(--navy-400) !important;
+}
+
+/* Input Styles */
+.stTextInput > div > div > input,
+.stTextArea textarea {
+  background: white !important;
+  color: var(--navy-800) !important;
+  border: 1px solid var(--navy-300) !important;
+  border-radius: 8px !important;
+  font-family: 'DM Sans', sans-serif !important;
+}
+
+.stTextInput > div > div > input:focus,
+.stTextArea textarea:focus {
+  border-color: var(--accent-indigo) !important;
+  box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.1) !important;
+}
+
+/* DataFrames */
+[data-testid="stDataFrame"] {
+  border: 1px solid var(--navy-200) !important;
+  border-radius: 8px !important;
+}
+
+/* Code Blocks */
+div[data-testid="stMarkdownContainer"] code {
+  background: var(--navy-100) !important;
+  color: var(--navy-700) !important;
+  border-radius: 4px !important;
+  padding: 0.2rem 0.4rem !important;
+  font-family: 'JetBrains Mono', monospace !important;
+  font-size: 0.85rem !important;
+}
+
+/* Summary Points */
+.summary-point {
+  display: flex;
+  align-items: flex-start;
+  gap: 0.5rem;
+  margin-bottom: 0.5rem;
+  font-size: 0.9rem;
+  color: var(--navy-700);
+}
+
+.summary-point::before {
+  content: "•";
+  color: var(--accent-indigo);
+  font-weight: bold;
+}
+
+/* Q&A Chat */
+.chat-item {
+  background: var(--navy-50);
+  border: 1px solid var(--navy-200);
+  border-radius: 8px;
+  padding: 1rem;
+  margin-bottom: 1rem;
+}
+
+.chat-question {
+  font-weight: 600;
+  color: var(--navy-900);
+  margin-bottom: 0.5rem;
+}
+
+.chat-answer {
+  color: var(--navy-700);
+  line-height: 1.6;
+  margin-bottom: 0.5rem;
+}
+
+.chat-meta {
+  font-size: 0.8rem;
+  color: var(--navy-500);
+  padding-top: 0.5rem;
+  border-top: 1px solid var(--navy-200);
+}
+
+/* Footer */
+.system-footer {
+  font-size: 0.8rem;
+  color: var(--navy-500);
+  text-align: center;
+  padding-top: 1.5rem;
+  margin-top: 2rem;
+  border-top: 1px solid var(--navy-200);
+}
+
+/* Responsive */
+@media (max-width: 768px) {
+  .block-container {
+    padding-top: 1rem;
+  }
+  
+  .system-header {
+    padding: 1rem;
+  }
+  
+  .status-row {
+    grid-template-columns: 1fr;
+  }
+}
+</style>
+"""
+
+HEADER_HTML = """
+<div class="system-header">
+  <div class="system-title">
+    <div class="system-title-icon">📄</div>
+    <span>Document Intelligence System</span>
+  </div>
+  <div class="status-row">
+    <div class="status-badge">
+      <span class="status-indicator"></span>
+      OCR Engine Online
+    </div>
+    <div class="status-badge">
+      <span class="status-indicator indigo"></span>
+      Entity Extractor Active
+    </div>
+    <div class="status-badge">
+      <span class="status-indicator indigo"></span>
+      Q&A System Ready
+    </div>
+    <div class="status-badge">
+      <span class="status-indicator processing"></span>
+      Export Module Ready
+    </div>
+  </div>
+</div>
+"""
+
+HEADER_BLOCK = _minify_markup(THEME_CSS) + _minify_markup(HEADER_HTML)
+
+PANEL_TITLE_TEMPLATE = (
+    '<div class="panel-title"><span class="panel-title-icon">{icon}</span>{title}</div>'
+)
+
+METRIC_CARD_TEMPLATE = (
+    "<div class='metric-card'><div class='metric-label'>{label}</div>"
+    "<div class='metric-value {highlight}'>{value}</div></div>"
+)
+HIGHLIGHTED_METRICS = frozenset({"Pages", "Words"})
+
+FOOTER_TEMPLATE = (
+    '<div class="system-footer">API Endpoint: <code>{api_base_url}</code> | '
+    "Document Intelligence System v1.0 | Processing Mode: {mode}</div>"
+)
+
+CHAT_ITEM_TEMPLATE = (
+    '<div class="chat-item"><div class="chat-question">Q: {question}</div>'
+    '<div class="chat-answer">{answer}</div>'
+    '<div class="chat-meta">Sources: {sources} | Confidence: {confidence}</div></div>'
+)
+
+
+@lru_cache(maxsize=None)
+def panel_title_markup(icon: str, title: str) -> str:
+    # A handful of fixed (icon, title) pairs, so each is formatted once.
+    return PANEL_TITLE_TEMPLATE.format(icon=icon, title=title)
+
+
+@lru_cache(maxsize=None)
+def footer_markup(api_base_url: str, mode: str) -> str:
+    return FOOTER_TEMPLATE.format(api_base_url=api_base_url, mode=mode.upper())
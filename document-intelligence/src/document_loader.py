@@ -3,22 +3,23 @@
 from __future__ import annotations
 
 import io
-import re
 from dataclasses import dataclass
 from hashlib import sha1
 from pathlib import Path
+from typing import BinaryIO
 
 from pypdf import PdfReader
 
-from src.ocr_engine import extract_text_from_image_bytes
+from src.ocr_engine import extract_pages_from_image_file
+from src.text_processor import EXCESS_NEWLINES_PATTERN, HORIZONTAL_WS_PATTERN
 
 SUPPORTED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".tif", ".tiff"}
 
 
 def _normalize_text(value: str) -> str:
     value = value.replace("\u00a0", " ")
-    value = re.sub(r"[ \t]+", " ", value)
-    value = re.sub(r"\n{3,}", "\n\n", value)
+    value = HORIZONTAL_WS_PATTERN.sub(" ", value)
+    value = EXCESS_NEWLINES_PATTERN.sub("\n\n", value)
     return value.strip()
 
 
@@ -36,16 +37,43 @@ class DocumentLoadResult:
 
     @property
     def text(self) -> str:
-        rendered: list[str] = []
+        # Pages are already normalized (stripped), so each one can be written
+        # straight into the buffer without building per-page copies first.
+        buffer = io.StringIO()
         for idx, page in enumerate(self.pages, start=1):
-            rendered.append(f"[Page {idx}]\n{page}".strip())
-        return "\n\n".join(rendered).strip()
-
-
-def load_document(file_bytes: bytes, filename: str) -> DocumentLoadResult:
-    """Load bytes into normalized text pages."""
-    if not file_bytes:
+            if idx > 1:
+                buffer.write("\n\n")
+            buffer.write(f"[Page {idx}]")
+            if page:
+                buffer.write("\n")
+                buffer.write(page)
+        return buffer.getvalue()
+
+
+def compute_document_id(source: bytes | BinaryIO, filename: str) -> str:
+    """Derive the stable document id used to key processed results."""
+    if isinstance(source, bytes):
+        size, head = len(source), source[:256]
+    else:
+        size = source.seek(0, io.SEEK_END)
+        source.seek(0)
+        head = source.read(256)
+        source.seek(0)
+
+    digest_seed = filename.encode("utf-8") + str(size).encode("utf-8")
+    return sha1(digest_seed + head).hexdigest()[:16]
+
+
+def load_document(source: bytes | BinaryIO, filename: str) -> DocumentLoadResult:
+    """Load bytes or a seekable binary stream into normalized text pages.
+
+    Passing the upload stream lets pypdf and Pillow read it on demand instead
+    of holding a second full copy of the file in memory.
+    """
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
+    if stream.seek(0, io.SEEK_END) == 0:
         raise ValueError("Uploaded file is empty.")
+    stream.seek(0)
 
     extension = Path(filename).suffix.lower()
     if extension not in SUPPORTED_EXTENSIONS:
@@ -53,11 +81,10 @@ def load_document(file_bytes: bytes, filename: str) -> DocumentLoadResult:
             "Unsupported file type. Allowed: PDF, PNG, JPG, JPEG, TIFF."
         )
 
-    digest_seed = filename.encode("utf-8") + str(len(file_bytes)).encode("utf-8")
-    document_id = sha1(digest_seed + file_bytes[:256]).hexdigest()[:16]
+    document_id = compute_document_id(stream, filename)
 
     if extension == ".pdf":
-        reader = PdfReader(io.BytesIO(file_bytes))
+        reader = PdfReader(stream)
         pages = [_normalize_text(page.extract_text() or "") for page in reader.pages]
         if not any(pages):
             raise ValueError(
@@ -72,14 +99,15 @@ def load_document(file_bytes: bytes, filename: str) -> DocumentLoadResult:
             used_ocr=False,
         )
 
-    text = _normalize_text(extract_text_from_image_bytes(file_bytes))
-    if not text:
+    # Multi-page TIFFs yield one page per frame, OCR'd in a single batch.
+    pages = [_normalize_text(text) for text in extract_pages_from_image_file(stream)]
+    if not any(pages):
         raise ValueError("OCR completed but no readable text was detected.")
 
     return DocumentLoadResult(
         document_id=document_id,
         filename=filename,
         document_type="image",
-        pages=[text],
+        pages=pages,
         used_ocr=True,
     )
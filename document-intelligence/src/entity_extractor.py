@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import re
-from collections import OrderedDict
 from typing import Any
 
 DATE_PATTERN = re.compile(
@@ -31,8 +30,15 @@ ORG_PATTERN = re.compile(
 
 
 def _unique_matches(values: list[str], limit: int = 10) -> list[str]:
-    deduped = OrderedDict((value.strip(), None) for value in values if value.strip())
-    return list(deduped.keys())[:limit]
+    # Single pass that strips each match once and stops at ``limit`` uniques.
+    deduped: dict[str, None] = {}
+    for value in values:
+        value = value.strip()
+        if value and value not in deduped:
+            deduped[value] = None
+            if len(deduped) >= limit:
+                break
+    return list(deduped)
 
 
 def _build_items(values: list[str], label: str, confidence: float) -> list[dict[str, Any]]:
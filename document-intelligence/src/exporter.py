@@ -4,31 +4,31 @@ from __future__ import annotations
 
 import csv
 import io
-import json
-from typing import Any
+from typing import Any, Iterator
 
-from openpyxl import Workbook
+import orjson
+
+
+def _entity_rows(entities: dict[str, list[dict[str, Any]]]) -> Iterator[list[Any]]:
+    for entity_type, values in entities.items():
+        for item in values:
+            yield [
+                entity_type,
+                item.get("value", ""),
+                item.get("label", ""),
+                item.get("confidence", ""),
+            ]
 
 
 def export_json(payload: dict[str, Any]) -> bytes:
-    return json.dumps(payload, indent=2).encode("utf-8")
+    return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
 
 
 def export_csv(entities: dict[str, list[dict[str, Any]]]) -> bytes:
     buffer = io.StringIO()
     writer = csv.writer(buffer)
     writer.writerow(["entity_type", "value", "label", "confidence"])
-
-    for entity_type, values in entities.items():
-        for item in values:
-            writer.writerow(
-                [
-                    entity_type,
-                    item.get("value", ""),
-                    item.get("label", ""),
-                    item.get("confidence", ""),
-                ]
-            )
+    writer.writerows(_entity_rows(entities))
 
     return buffer.getvalue().encode("utf-8")
 
@@ -39,6 +39,10 @@ def export_excel(
     key_points: list[str],
     entities: dict[str, list[dict[str, Any]]],
 ) -> bytes:
+    # openpyxl takes a couple hundred milliseconds to import; only pay for it
+    # when a workbook is actually requested.
+    from openpyxl import Workbook
+
     workbook = Workbook()
     ws_summary = workbook.active
     ws_summary.title = "Summary"
@@ -52,16 +56,8 @@ def export_excel(
 
     ws_entities = workbook.create_sheet("Entities")
     ws_entities.append(["Type", "Value", "Label", "Confidence"])
-    for entity_type, values in entities.items():
-        for item in values:
-            ws_entities.append(
-                [
-                    entity_type,
-                    item.get("value", ""),
-                    item.get("label", ""),
-                    item.get("confidence", ""),
-                ]
-            )
+    for row in _entity_rows(entities):
+        ws_entities.append(row)
 
     data = io.BytesIO()
     workbook.save(data)
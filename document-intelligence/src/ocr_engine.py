@@ -3,26 +3,65 @@
 from __future__ import annotations
 
 import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO
 
-from PIL import Image, UnidentifiedImageError
+from PIL import Image, ImageSequence, UnidentifiedImageError
 
 try:
     import pytesseract
 except Exception:  # pragma: no cover - import fallback for minimal environments
     pytesseract = None
 
+TRAILING_WS_PATTERN = re.compile(r"[^\S\n]+$", re.MULTILINE)
+MAX_OCR_WORKERS = min(4, os.cpu_count() or 1)
 
-def extract_text_from_image_bytes(image_bytes: bytes) -> str:
-    """Extract text from image bytes using Tesseract OCR."""
+
+def _require_tesseract() -> None:
     if pytesseract is None:
         raise RuntimeError(
             "pytesseract is unavailable. Install Tesseract OCR and the pytesseract package."
         )
 
+
+def _open_image(source: bytes | BinaryIO) -> Image.Image:
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
     try:
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        return Image.open(stream)
     except UnidentifiedImageError as exc:  # pragma: no cover - defensive path
         raise ValueError("Unsupported or corrupted image file.") from exc
 
-    text = pytesseract.image_to_string(image)
-    return "\n".join(line.rstrip() for line in text.splitlines()).strip()
+
+def _ocr_image(image: Image.Image) -> str:
+    text = pytesseract.image_to_string(image.convert("RGB"))
+    return TRAILING_WS_PATTERN.sub("", text).strip()
+
+
+def extract_text_from_images(images: list[Image.Image]) -> list[str]:
+    """Extract text from a batch of images, one result per image."""
+    _require_tesseract()
+    if len(images) < 2 or MAX_OCR_WORKERS < 2:
+        return [_ocr_image(image) for image in images]
+
+    # pytesseract shells out to the tesseract binary, so threads overlap the
+    # recognition work without contending for the GIL. Deployments set
+    # OMP_THREAD_LIMIT=1 so parallel Tesseract processes do not each spin up
+    # an OpenMP pool and oversubscribe the CPU.
+    with ThreadPoolExecutor(max_workers=min(MAX_OCR_WORKERS, len(images))) as executor:
+        return list(executor.map(_ocr_image, images))
+
+
+def extract_pages_from_image_file(source: bytes | BinaryIO) -> list[str]:
+    """Extract text from every frame of an image file (e.g. multi-page TIFF)."""
+    _require_tesseract()
+    image = _open_image(source)
+    frames = [frame.copy() for frame in ImageSequence.Iterator(image)]
+    return extract_text_from_images(frames)
+
+
+def extract_text_from_image_bytes(image_bytes: bytes) -> str:
+    """Extract text from image bytes using Tesseract OCR."""
+    _require_tesseract()
+    return _ocr_image(_open_image(image_bytes))
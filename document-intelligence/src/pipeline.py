@@ -2,19 +2,27 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+import orjson
 
 from src.document_loader import load_document
 from src.entity_extractor import extract_entities
-from src.summarizer import generate_summary, key_points
-from src.text_processor import chunk_text, clean_text
+from src.exporter import export_csv, export_excel
+from src.qa_engine import MAX_CACHED_ANSWERS, answer_question, question_key
+from src.summarizer import summarize
+from src.text_processor import chunk_text, clean_text, count_words
+from src.vector_store import ChunkIndex, build_index
 
 
 @dataclass(slots=True)
 class ProcessedDocument:
     document_id: str
     filename: str
+    file_stem: str
     page_count: int
     word_count: int
     processing_mode: str
@@ -24,13 +32,19 @@ class ProcessedDocument:
     text_preview: str
     entities: dict[str, list[dict[str, object]]]
     chunks: list[str]
+    index: ChunkIndex
     suggested_questions: list[str]
     created_at: str
+    _serialized: dict[str, bytes] = field(default_factory=dict, init=False, repr=False)
+    _answers: dict[frozenset[str], dict[str, object]] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     def response_payload(self) -> dict[str, object]:
         return {
             "document_id": self.document_id,
             "filename": self.filename,
+            "file_stem": self.file_stem,
             "page_count": self.page_count,
             "word_count": self.word_count,
             "processing_mode": self.processing_mode,
@@ -42,6 +56,60 @@ class ProcessedDocument:
             "created_at": self.created_at,
         }
 
+    def payload_json(self) -> bytes:
+        """Serialized ``response_payload``, encoded once per document."""
+        return self._cached("payload", lambda: orjson.dumps(self.response_payload()))
+
+    def iter_json_export(self, chunk_chars: int = 65536) -> Iterator[bytes]:
+        """Stream the JSON export, emitting the full text in bounded slices.
+
+        The output is compact, unlike the indented ``export_json`` download
+        offered by the Streamlit UI; the keys and values are the same.
+        """
+        yield b'{"document":'
+        yield self.payload_json()
+        yield b',"full_text":"'
+        text = self.text
+        for start in range(0, len(text), chunk_chars):
+            yield orjson.dumps(text[start : start + chunk_chars])[1:-1]
+        yield b'"}'
+
+    def export_bytes(self, export_format: str) -> bytes:
+        """Serialized export (``csv`` or ``xlsx``), built once per document."""
+        if export_format == "csv":
+            return self._cached("csv", lambda: export_csv(self.entities))
+        if export_format == "xlsx":
+            return self._cached(
+                "xlsx",
+                lambda: export_excel(
+                    filename=self.filename,
+                    summary=self.summary,
+                    key_points=self.key_points,
+                    entities=self.entities,
+                ),
+            )
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    def answer(self, question: str) -> dict[str, object]:
+        """Answer ``question``, reusing the result for rephrasings with the same terms.
+
+        Retrieval and sentence selection only look at the set of non-stop-word
+        tokens, so "What is the total?" and "total, what is it" share an answer.
+        """
+        key = question_key(question)
+        result = self._answers.get(key)
+        if result is None:
+            result = answer_question(question, self.index)
+            if len(self._answers) < MAX_CACHED_ANSWERS:
+                self._answers[key] = result
+        return result
+
+    def _cached(self, key: str, build: Callable[[], bytes]) -> bytes:
+        data = self._serialized.get(key)
+        if data is None:
+            data = self._serialized[key] = build()
+        return data
+
 
 def _generate_suggested_questions(
     filename: str, entities: dict[str, list[dict[str, object]]]
@@ -60,8 +128,8 @@ def _generate_suggested_questions(
     return questions[:5]
 
 
-def run_pipeline(file_bytes: bytes, filename: str) -> ProcessedDocument:
-    loaded = load_document(file_bytes=file_bytes, filename=filename)
+def run_pipeline(source: bytes | BinaryIO, filename: str) -> ProcessedDocument:
+    loaded = load_document(source=source, filename=filename)
     cleaned = clean_text(loaded.text)
 
     if not cleaned:
@@ -69,13 +137,13 @@ def run_pipeline(file_bytes: bytes, filename: str) -> ProcessedDocument:
 
     chunks = chunk_text(cleaned)
     entities = extract_entities(cleaned)
-    summary = generate_summary(cleaned)
-    points = key_points(cleaned)
-    word_count = len(cleaned.split())
+    summary, points = summarize(cleaned)
+    word_count = count_words(cleaned)
 
     return ProcessedDocument(
         document_id=loaded.document_id,
         filename=loaded.filename,
+        file_stem=Path(loaded.filename).stem,
         page_count=loaded.page_count,
         word_count=word_count,
         processing_mode="OCR" if loaded.used_ocr else "Native Text Extraction",
@@ -85,6 +153,7 @@ def run_pipeline(file_bytes: bytes, filename: str) -> ProcessedDocument:
         text_preview=cleaned[:1400],
         entities=entities,
         chunks=chunks,
+        index=build_index(chunks),
         suggested_questions=_generate_suggested_questions(loaded.filename, entities),
         created_at=datetime.now(timezone.utc).isoformat(),
     )
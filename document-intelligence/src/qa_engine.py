@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 from src.text_processor import sentence_split, tokenize
-from src.vector_store import retrieve_chunks
+from src.vector_store import ChunkIndex, build_index, search_index
 
+# Upper bound for per-document answer caches keyed by ``question_key``.
+MAX_CACHED_ANSWERS = 256
 
-def answer_question(question: str, chunks: list[str]) -> dict[str, object]:
-    retrieval = retrieve_chunks(chunks, question, top_k=3)
+
+def question_key(question: str) -> frozenset[str]:
+    """Distinct query terms; questions with the same key get the same answer."""
+    return frozenset(tokenize(question))
+
+
+def answer_question(question: str, chunks: list[str] | ChunkIndex) -> dict[str, object]:
+    index = chunks if isinstance(chunks, ChunkIndex) else build_index(chunks)
+    retrieval = search_index(index, question, top_k=3)
     if not retrieval:
         return {
             "answer": "I could not find enough evidence in the uploaded document to answer that question.",
@@ -7,13 +7,7 @@ from collections import Counter
 from src.text_processor import sentence_split, tokenize
 
 
-def generate_summary(text: str, max_sentences: int = 4) -> str:
-    sentences = sentence_split(text)
-    if not sentences:
-        return "No summary available."
-    if len(sentences) <= max_sentences:
-        return " ".join(sentences)
-
+def _rank_sentences(text: str, sentences: list[str]) -> list[tuple[int, float]]:
     frequencies = Counter(tokenize(text))
     sentence_scores: list[tuple[int, float]] = []
 
@@ -24,16 +18,54 @@ def generate_summary(text: str, max_sentences: int = 4) -> str:
         score = sum(frequencies[word] for word in words) / len(words)
         sentence_scores.append((index, score))
 
-    ranked = sorted(sentence_scores, key=lambda item: item[1], reverse=True)[:max_sentences]
-    selected_indices = sorted(index for index, _ in ranked)
+    return sorted(sentence_scores, key=lambda item: item[1], reverse=True)
+
+
+def _select_sentences(
+    sentences: list[str], ranked: list[tuple[int, float]], max_sentences: int
+) -> str:
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)
+
+    selected_indices = sorted(index for index, _ in ranked[:max_sentences])
     return " ".join(sentences[index] for index in selected_indices)
 
 
+def _points_from_summary(summary: str, max_points: int) -> list[str]:
+    trimmed = [sentence.rstrip(".") for sentence in sentence_split(summary) if sentence.strip()]
+    return trimmed[:max_points]
+
+
+def generate_summary(text: str, max_sentences: int = 4) -> str:
+    sentences = sentence_split(text)
+    if not sentences:
+        return "No summary available."
+    if len(sentences) <= max_sentences:
+        return " ".join(sentences)
+
+    return _select_sentences(sentences, _rank_sentences(text, sentences), max_sentences)
+
+
 def key_points(text: str, max_points: int = 6) -> list[str]:
     sentences = sentence_split(text)
     if not sentences:
         return ["No key points extracted."]
 
-    summary_sentences = sentence_split(generate_summary(text, max_sentences=max_points))
-    trimmed = [sentence.rstrip(".") for sentence in summary_sentences if sentence.strip()]
-    return trimmed[:max_points]
+    return _points_from_summary(generate_summary(text, max_sentences=max_points), max_points)
+
+
+def summarize(
+    text: str, max_sentences: int = 4, max_points: int = 6
+) -> tuple[str, list[str]]:
+    """Return ``(summary, key_points)`` from a single split-and-rank pass."""
+    sentences = sentence_split(text)
+    if not sentences:
+        return "No summary available.", ["No key points extracted."]
+
+    ranked: list[tuple[int, float]] = []
+    if len(sentences) > min(max_sentences, max_points):
+        ranked = _rank_sentences(text, sentences)
+
+    summary = _select_sentences(sentences, ranked, max_sentences)
+    points = _points_from_summary(_select_sentences(sentences, ranked, max_points), max_points)
+    return summary, points
@@ -32,25 +32,44 @@ STOP_WORDS = {
     "have",
 }
 
+HORIZONTAL_WS_PATTERN = re.compile(r"[ \t]+")
+EXCESS_NEWLINES_PATTERN = re.compile(r"\n{3,}")
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+")
+
+
+def _ensure_utf8(text: str) -> str:
+    """Replace lone surrogates left by text extraction; orjson refuses to encode them."""
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        return text.encode("utf-8", "replace").decode("utf-8")
+    return text
+
 
 def clean_text(text: str) -> str:
+    text = _ensure_utf8(text)
     text = text.replace("\r\n", "\n").replace("\r", "\n")
     text = text.replace("\u00a0", " ")
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = HORIZONTAL_WS_PATTERN.sub(" ", text)
+    text = EXCESS_NEWLINES_PATTERN.sub("\n\n", text)
     return text.strip()
 
 
 def sentence_split(text: str) -> list[str]:
-    chunks = re.split(r"(?<=[.!?])\s+", text)
+    chunks = SENTENCE_BOUNDARY_PATTERN.split(text)
     return [chunk.strip() for chunk in chunks if chunk.strip()]
 
 
 def tokenize(text: str) -> list[str]:
-    tokens = [token.lower() for token in re.findall(r"[A-Za-z0-9]+", text)]
+    tokens = [token.lower() for token in TOKEN_PATTERN.findall(text)]
     return [token for token in tokens if token not in STOP_WORDS and len(token) > 1]
 
 
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
 def chunk_text(text: str, max_chars: int = 900, overlap_chars: int = 120) -> list[str]:
     """Chunk text into overlapping windows to support retrieval."""
     if not text:
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import heapq
+import sys
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 
 from src.text_processor import tokenize
@@ -14,25 +18,60 @@ class ChunkScore:
     score: float
 
 
-def retrieve_chunks(chunks: list[str], query: str, top_k: int = 3) -> list[ChunkScore]:
+@dataclass(slots=True)
+class ChunkIndex:
+    """Inverted index over document chunks, built once per document.
+
+    Tokens are interned so every chunk shares one string object per term, and
+    postings are packed into unsigned int arrays instead of lists of ints.
+    Only the distinct-token count of each chunk is kept, since overlap with a
+    query is counted straight from the postings.
+    """
+
+    chunks: list[str]
+    token_counts: array
+    postings: dict[str, array]
+
+
+def build_index(chunks: list[str]) -> ChunkIndex:
+    token_counts = array("I")
+    postings: dict[str, array] = {}
+
+    for idx, chunk in enumerate(chunks):
+        tokens = set(map(sys.intern, tokenize(chunk)))
+        token_counts.append(len(tokens))
+        for token in tokens:
+            bucket = postings.get(token)
+            if bucket is None:
+                bucket = postings[token] = array("I")
+            bucket.append(idx)
+
+    return ChunkIndex(chunks=chunks, token_counts=token_counts, postings=postings)
+
+
+def search_index(index: ChunkIndex, query: str, top_k: int = 3) -> list[ChunkScore]:
     query_tokens = set(tokenize(query))
     if not query_tokens:
         return []
 
-    scored: list[ChunkScore] = []
-    for idx, chunk in enumerate(chunks):
-        chunk_tokens = set(tokenize(chunk))
-        if not chunk_tokens:
-            continue
+    overlaps: Counter[int] = Counter()
+    for token in query_tokens:
+        overlaps.update(index.postings.get(token, ()))
+
+    query_size = len(query_tokens)
+    scored: list[tuple[float, int]] = []
+    for idx in sorted(overlaps):
+        overlap = overlaps[idx]
+        lexical = overlap / query_size
+        density = overlap / index.token_counts[idx]
+        scored.append((round((lexical * 0.75) + (density * 0.25), 4), idx))
 
-        overlap = query_tokens.intersection(chunk_tokens)
-        if not overlap:
-            continue
+    top = heapq.nlargest(top_k, scored, key=lambda item: item[0])
+    return [
+        ChunkScore(chunk_id=idx + 1, text=index.chunks[idx], score=score)
+        for score, idx in top
+    ]
 
-        lexical = len(overlap) / max(len(query_tokens), 1)
-        density = len(overlap) / max(len(chunk_tokens), 1)
-        score = round((lexical * 0.75) + (density * 0.25), 4)
-        scored.append(ChunkScore(chunk_id=idx + 1, text=chunk, score=score))
 
-    scored.sort(key=lambda item: item.score, reverse=True)
-    return scored[:top_k]
+def retrieve_chunks(chunks: list[str], query: str, top_k: int = 3) -> list[ChunkScore]:
+    return search_index(build_index(chunks), query, top_k=top_k)
@@ -1,7 +1,11 @@
 import asyncio
 import inspect
+from types import SimpleNamespace
+
 import pytest
 
+from app import store
+
 
 def pytest_configure(config):
     config.addinivalue_line(
@@ -21,3 +25,19 @@ def pytest_pyfunc_call(pyfuncitem):
             asyncio.set_event_loop(None)
         return True
     return None
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive ``TTLStore`` expiry by hand instead of sleeping."""
+    fake = FakeClock()
+    monkeypatch.setattr(store, "time", SimpleNamespace(monotonic=fake))
+    return fake
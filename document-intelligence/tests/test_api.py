@@ -0,0 +1,103 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import JOB_STATUS, app, settings
+from app.models import DocumentStatus, StatusResponse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "sample_docs"))
+from generate_sample_docs import build_invoice  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def invoice_pdf(tmp_path_factory):
+    path = tmp_path_factory.mktemp("docs") / "invoice.pdf"
+    build_invoice(path)
+    return path.read_bytes()
+
+
+def test_async_processing_completes_and_serves_document(client, invoice_pdf):
+    response = client.post("/process/async", files={"file": ("invoice.pdf", invoice_pdf)})
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "processing"
+    document_id = body["document_id"]
+
+    # TestClient runs background tasks before returning the response.
+    status = client.get(f"/status/{document_id}")
+    assert status.status_code == 200
+    assert status.json()["status"] == "completed"
+
+    document = client.get(f"/documents/{document_id}")
+    assert document.status_code == 200
+    assert document.json()["document_id"] == document_id
+    assert document.json()["word_count"] > 0
+
+
+def test_async_processing_reports_failures(client):
+    response = client.post("/process/async", files={"file": ("broken.pdf", b"not a pdf")})
+    assert response.status_code == 202
+    document_id = response.json()["document_id"]
+
+    status = client.get(f"/status/{document_id}")
+    assert status.status_code == 200
+    assert status.json()["status"] == "failed"
+    assert status.json()["detail"]
+
+    assert client.get(f"/documents/{document_id}").status_code == 404
+
+
+def test_unknown_document_returns_404(client):
+    assert client.get("/status/missing").status_code == 404
+    assert client.get("/documents/missing").status_code == 404
+
+
+def test_status_expires_with_the_document(client, invoice_pdf, clock):
+    response = client.post("/process/async", files={"file": ("evicted.pdf", invoice_pdf)})
+    document_id = response.json()["document_id"]
+    ttl = settings.doc_ttl_seconds
+
+    # Polling status keeps the document itself alive...
+    for _ in range(3):
+        clock.now += ttl * 0.6
+        assert client.get(f"/status/{document_id}").json()["status"] == "completed"
+    assert client.get(f"/documents/{document_id}").status_code == 200
+
+    # ...and once it is evicted, status stops claiming it is completed.
+    clock.now += ttl + 1
+    assert client.get(f"/status/{document_id}").status_code == 404
+    assert client.get(f"/documents/{document_id}").status_code == 404
+
+
+def test_sync_processing_clears_a_stale_failure(client, invoice_pdf):
+    response = client.post("/process", files={"file": ("retried.pdf", invoice_pdf)})
+    document_id = response.json()["document_id"]
+    JOB_STATUS[document_id] = StatusResponse(
+        document_id=document_id, status=DocumentStatus.FAILED, detail="earlier attempt"
+    )
+
+    client.post("/process", files={"file": ("retried.pdf", invoice_pdf)})
+
+    assert client.get(f"/status/{document_id}").json()["status"] == "completed"
+    assert JOB_STATUS.get(document_id) is None
+
+
+def test_json_export_streams_valid_json(client, invoice_pdf):
+    document_id = client.post("/process", files={"file": ("invoice.pdf", invoice_pdf)}).json()[
+        "document_id"
+    ]
+
+    response = client.get(f"/export/{document_id}/json")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].endswith('invoice_entities.json"')
+    exported = json.loads(response.content)
+    assert exported["document"]["document_id"] == document_id
+    assert exported["full_text"].startswith("[Page 1]")
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from src import pipeline
+from src.document_loader import DocumentLoadResult
+
+
+@pytest.fixture
+def load_pages(monkeypatch):
+    """Run the pipeline over the given page texts instead of a real file."""
+
+    def build(*pages: str) -> pipeline.ProcessedDocument:
+        result = DocumentLoadResult(
+            document_id="doc-1",
+            filename="notes.pdf",
+            document_type="pdf",
+            pages=list(pages),
+            used_ocr=False,
+        )
+        monkeypatch.setattr(pipeline, "load_document", lambda source, filename: result)
+        return pipeline.run_pipeline(b"%PDF", "notes.pdf")
+
+    return build
+
+
+def test_lone_surrogates_do_not_break_serialization(load_pages):
+    document = load_pages("Total due \ud800 by Friday. Contact billing@example.com.")
+
+    assert "\ud800" not in document.text
+    assert json.loads(document.payload_json())["document_id"] == "doc-1"
+    assert "Total due" in json.loads(b"".join(document.iter_json_export()))["full_text"]
+
+
+def test_json_export_round_trips_text_across_slices(load_pages):
+    document = load_pages('She said "paid\\in full"\non 3 März — 1 000 €.\n\nDone ✓')
+
+    for chunk_chars in (1, 2, 3, 65536):
+        exported = json.loads(b"".join(document.iter_json_export(chunk_chars=chunk_chars)))
+        assert exported["full_text"] == document.text
+        assert exported["document"] == json.loads(document.payload_json())
@@ -0,0 +1,53 @@
+from app.store import TTLStore
+
+
+def test_evicts_least_recently_used_at_maxsize(clock):
+    cache = TTLStore(maxsize=2, ttl_seconds=60)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1  # "b" is now the least recently used
+
+    cache["c"] = 3
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLStore(maxsize=4, ttl_seconds=10)
+    cache["a"] = 1
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+
+    clock.now += 10
+    assert cache.get("a") is None
+
+
+def test_get_refreshes_ttl(clock):
+    cache = TTLStore(maxsize=4, ttl_seconds=10)
+    cache["a"] = 1
+
+    for _ in range(3):
+        clock.now += 8
+        assert cache.get("a") == 1
+
+    clock.now += 10
+    assert cache.get("a") is None
+
+
+def test_len_purges_expired_entries(clock):
+    cache = TTLStore(maxsize=4, ttl_seconds=10)
+    cache["a"] = 1
+    clock.now += 5
+    cache["b"] = 2
+    assert len(cache) == 2
+
+    clock.now += 6
+    assert len(cache) == 1
+    assert cache.get("b") == 2
+
+    clock.now += 10
+    assert len(cache) == 0